@@ -1,14 +1,16 @@
 """Config flow for Google Gemini Usage integration."""
+import hashlib
 import logging
+import time
 from typing import Any
 
 import voluptuous as vol
-import google.generativeai as genai
-from google.api_core import exceptions as google_exceptions
+from aiohttp import ClientError, ClientTimeout
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_API_KEY
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import DOMAIN
@@ -21,12 +23,43 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# How long a successfully validated API key is trusted before re-checking
+VALIDATION_TTL = 86400
+
+# Map of API key hash to the monotonic time its validation expires
+_VALIDATED: dict[str, float] = {}
+
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate we cannot connect."""
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate the API key was rejected."""
+
+
 async def validate_api_key(api_key: str, hass) -> None:
-    """Validate the API key by making a test call to the API."""
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-pro')
-    # Use run_in_executor to avoid blocking the event loop
-    await hass.async_add_executor_job(model.generate_content, "test")
+    """Validate the API key by listing the models available to it."""
+    key_hash = hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+    if _VALIDATED.get(key_hash, 0) > time.monotonic():
+        return
+
+    session = async_get_clientsession(hass)
+    try:
+        async with session.get(
+            MODELS_URL, params={"key": api_key}, timeout=ClientTimeout(total=10)
+        ) as response:
+            # The API answers 400 (API_KEY_INVALID) as well as 401/403 for bad keys
+            if response.status in (400, 401, 403):
+                _VALIDATED.pop(key_hash, None)
+                raise InvalidAuth(f"API key rejected with status {response.status}")
+            response.raise_for_status()
+    except (ClientError, TimeoutError) as err:
+        raise CannotConnect(str(err)) from err
+
+    _VALIDATED[key_hash] = time.monotonic() + VALIDATION_TTL
 
 
 class GeminiUsageConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -50,9 +83,9 @@ class GeminiUsageConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(
                     title="Google Gemini Usage", data=user_input
                 )
-            except google_exceptions.PermissionDenied:
+            except InvalidAuth:
                 errors["base"] = "invalid_auth"
-            except google_exceptions.GoogleAPIError:
+            except CannotConnect:
                 errors["base"] = "cannot_connect"
             except Exception as e:
                 _LOGGER.exception("Unexpected exception: %s", e)
@@ -13,3 +13,4 @@ ATTR_TOTAL_TOKENS = "total_tokens"
 
 # Sensor Names
 SENSOR_CALLS_NAME = "Total API Calls"
+SENSOR_CACHE_HITS_NAME = "Response Cache Hits"
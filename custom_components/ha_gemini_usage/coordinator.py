@@ -1,20 +1,71 @@
 """DataUpdateCoordinator for the Google Gemini Usage integration."""
+import hashlib
 import logging
-from datetime import timedelta
-from collections import defaultdict
+import operator
+import threading
+import time
+from collections import OrderedDict
 import datetime
+from typing import TYPE_CHECKING
 
 from homeassistant.util import dt as dt_util
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY
+from homeassistant.exceptions import HomeAssistantError
 
 from .const import DOMAIN
 
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 2
+RESPONSE_STORAGE_VERSION = 1
+
+# Seconds a change may wait before it is written to storage
+SAVE_DELAY = 30
+
+# Reads the (input, output, total) token counts from a response's usage metadata
+_USAGE_FIELDS = operator.attrgetter(
+    "prompt_token_count", "candidates_token_count", "total_token_count"
+)
+
+PERIOD_KEYS = ("daily", "weekly", "monthly")
+
+# usage_data keys holding datetimes, stored as ISO strings
+RESET_KEYS = tuple(f"last_reset_{period}" for period in PERIOD_KEYS)
+
+# genai.configure mutates SDK globals, so model setup is serialized process-wide.
+# The config flow's fixed unique ID allows a single entry, hence a single key.
+_GENAI_LOCK = threading.Lock()
+
+# Number of prompt responses kept by the response cache
+RESPONSE_CACHE_SIZE = 128
+
+# Bursts of API calls within this many seconds collapse into one refresh
+REFRESH_COOLDOWN = 1.0
+
+# Cumulative per-model token counters
+TOKEN_COUNTER_KEYS = ("input_tokens", "output_tokens", "total_tokens")
+
+# (counter, snapshot) key pairs per period; a period's usage is counter - snapshot
+SNAPSHOT_KEYS = {
+    period: tuple((key, f"{key}_{period}_snap") for key in TOKEN_COUNTER_KEYS)
+    for period in PERIOD_KEYS
+}
+
+# Per-model counters and snapshots, created when a model is registered
+MODEL_COUNTER_KEYS = TOKEN_COUNTER_KEYS + tuple(
+    snap_key for pairs in SNAPSHOT_KEYS.values() for _, snap_key in pairs
+)
+
 
 def get_period_start(period: str, now: datetime.datetime) -> datetime.datetime:
     """Get the start of the current period (daily, weekly, monthly)."""
@@ -28,72 +79,271 @@ def get_period_start(period: str, now: datetime.datetime) -> datetime.datetime:
     return now
 
 
+def get_next_period_start(period: str, now: datetime.datetime) -> datetime.datetime:
+    """Get the start of the period following the current one."""
+    start = get_period_start(period, now)
+    if period == "daily":
+        return start + datetime.timedelta(days=1)
+    if period == "weekly":
+        return start + datetime.timedelta(weeks=1)
+    if period == "monthly":
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+        return start.replace(month=start.month + 1)
+    return start
+
+
+def _serialize(usage_data: dict) -> dict:
+    """Convert usage data into a JSON-safe dict for storage."""
+    data = dict(usage_data)
+    for key in RESET_KEYS:
+        data[key] = usage_data[key].isoformat()
+    return data
+
+
+def _deserialize(data: dict) -> dict:
+    """Convert stored usage data back into its in-memory form."""
+    usage_data = dict(data)
+    now = dt_util.utcnow()
+    for period, key in zip(PERIOD_KEYS, RESET_KEYS):
+        value = data.get(key)
+        last_reset = dt_util.parse_datetime(value) if isinstance(value, str) else None
+        # A missing or unreadable reset time starts the period afresh
+        usage_data[key] = last_reset or get_period_start(period, now)
+    return usage_data
+
+
+class ResponseBlocked(HomeAssistantError):
+    """Error to indicate a response has no text, e.g. a safety-blocked prompt."""
+
+
+def _migrate_v1(data: dict) -> dict:
+    """Turn version 1 per-period counters into snapshots of the cumulative ones."""
+    total_requests = data.get("total_requests", 0)
+    for period in PERIOD_KEYS:
+        data[f"total_requests_{period}_snap"] = (
+            total_requests - data.pop(f"{period}_requests", 0)
+        )
+    for model in data.get("models", {}).values():
+        for period, pairs in SNAPSHOT_KEYS.items():
+            for key, snap_key in pairs:
+                model[snap_key] = model.get(key, 0) - model.pop(f"{period}_{key}", 0)
+    return data
+
+
+class _UsageStore(Store):
+    """Store for usage data that migrates older layouts on load."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """Migrate stored usage data to the current layout."""
+        if old_major_version == 1:
+            old_data = _migrate_v1(old_data)
+        return old_data
+
+
+def _storage_keys(entry_id: str) -> tuple[str, str]:
+    """Get the usage data and response cache storage keys of an entry."""
+    return f"{DOMAIN}_{entry_id}", f"{DOMAIN}_{entry_id}_responses"
+
+
+async def async_remove_stores(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored usage data and response cache of an entry."""
+    usage_key, response_key = _storage_keys(entry_id)
+    await Store(hass, STORAGE_VERSION, usage_key).async_remove()
+    await Store(hass, RESPONSE_STORAGE_VERSION, response_key).async_remove()
+
+
 class GeminiUsageDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Gemini usage data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        response_cache_size: int = RESPONSE_CACHE_SIZE,
+    ) -> None:
         """Initialize."""
         self.hass = hass
         self.entry = entry
         self.api_key = entry.data[CONF_API_KEY]
+        self._models: dict[str, "genai.GenerativeModel"] = {}
+        self._genai_configured = False
+
+        # Responses keyed by (model name, prompt hash), least recently used first
+        self._response_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._response_cache_size = response_cache_size
 
         now = dt_util.utcnow()
         self.usage_data = {
             "total_requests": 0,
-            "daily_requests": 0,
-            "weekly_requests": 0,
-            "monthly_requests": 0,
+            "total_requests_daily_snap": 0,
+            "total_requests_weekly_snap": 0,
+            "total_requests_monthly_snap": 0,
+            "cache_hits": 0,
             "last_reset_daily": get_period_start("daily", now),
             "last_reset_weekly": get_period_start("weekly", now),
             "last_reset_monthly": get_period_start("monthly", now),
-            "models": defaultdict(
-                lambda: {
-                    "input_tokens": 0, "output_tokens": 0, "total_tokens": 0,
-                    "daily_input_tokens": 0, "daily_output_tokens": 0, "daily_total_tokens": 0,
-                    "weekly_input_tokens": 0, "weekly_output_tokens": 0, "weekly_total_tokens": 0,
-                    "monthly_input_tokens": 0, "monthly_output_tokens": 0, "monthly_total_tokens": 0,
-                }
-            ),
+            "models": {},
         }
 
+        usage_key, response_key = _storage_keys(entry.entry_id)
+        self._store = _UsageStore(hass, STORAGE_VERSION, usage_key)
+        self._response_store = Store(hass, RESPONSE_STORAGE_VERSION, response_key)
+        # Whether a delayed write is pending; see _schedule_save
+        self._usage_save_pending = False
+        self._responses_save_pending = False
+        self._unsub_reset: CALLBACK_TYPE | None = None
+        self._set_next_resets()
+        entry.async_on_unload(self._cancel_reset_timer)
+
+        # Nothing is polled; the reset timer refreshes at each period boundary
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=5),
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REFRESH_COOLDOWN, immediate=True
+            ),
+        )
+
+    def _set_next_resets(self) -> None:
+        """Compute the next reset deadlines from the last reset of each period."""
+        # Integer POSIX deadlines, so the hot path only compares ints
+        self._next_daily = int(
+            get_next_period_start("daily", self.usage_data["last_reset_daily"]).timestamp()
+        )
+        self._next_weekly = int(
+            get_next_period_start("weekly", self.usage_data["last_reset_weekly"]).timestamp()
+        )
+        self._next_monthly = int(
+            get_next_period_start("monthly", self.usage_data["last_reset_monthly"]).timestamp()
+        )
+        self._schedule_next_reset()
+
+    def _schedule_next_reset(self) -> None:
+        """Arm a timer for the earliest upcoming period boundary."""
+        self._cancel_reset_timer()
+        delay = min(self._next_daily, self._next_weekly, self._next_monthly) - int(time.time())
+        self._unsub_reset = async_call_later(
+            self.hass, max(delay, 0), self._handle_period_boundary
         )
 
+    @callback
+    def _cancel_reset_timer(self) -> None:
+        """Cancel the pending period boundary timer."""
+        if self._unsub_reset is not None:
+            self._unsub_reset()
+            self._unsub_reset = None
+
+    @callback
+    def _handle_period_boundary(self, _now: datetime.datetime) -> None:
+        """Reset the periods that are due and refresh the sensors."""
+        self._unsub_reset = None
+        self._reset_if_needed()
+        self.hass.async_create_task(self.async_request_refresh())
+        self._schedule_next_reset()
+
+    async def async_load(self) -> None:
+        """Restore the usage data and cached responses saved by a previous run."""
+        if data := await self._store.async_load():
+            stored = _deserialize(data)
+            # Merge over the defaults so counters missing from storage start at 0
+            for model_name, counters in (stored.pop("models", None) or {}).items():
+                model_stats = self.register_model(model_name)
+                model_stats.update(
+                    (key, value) for key, value in counters.items() if key in model_stats
+                )
+            self.usage_data.update(
+                (key, value) for key, value in stored.items() if key in self.usage_data
+            )
+            self._set_next_resets()
+
+        responses = await self._response_store.async_load() or []
+        for item in responses[-self._response_cache_size:]:
+            self._response_cache[(item["model"], item["prompt_hash"])] = item["text"]
+
+    async def async_save(self) -> None:
+        """Save the usage data and cached responses so they survive a restart."""
+        await self._store.async_save(self._usage_data_to_save())
+        await self._response_store.async_save(self._responses_to_save())
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Write the usage data at most SAVE_DELAY seconds after the first unsaved change."""
+        # async_delay_save restarts its delay on every call, so only the first
+        # change arms it; otherwise steady traffic would postpone the write forever
+        if not self._usage_save_pending:
+            self._usage_save_pending = True
+            self._store.async_delay_save(self._usage_data_to_save, SAVE_DELAY)
+
+    @callback
+    def _schedule_response_save(self) -> None:
+        """Write the response cache at most SAVE_DELAY seconds after the first unsaved change."""
+        if not self._responses_save_pending:
+            self._responses_save_pending = True
+            self._schedule_response_save()
+
+    def _usage_data_to_save(self) -> dict:
+        """Convert the usage data for storage and clear the pending save."""
+        self._usage_save_pending = False
+        return _serialize(self.usage_data)
+
+    def _responses_to_save(self) -> list[dict[str, str]]:
+        """Convert the response cache into a list for storage, oldest first."""
+        self._responses_save_pending = False
+        return [
+            {"model": model_name, "prompt_hash": prompt_hash, "text": text}
+            for (model_name, prompt_hash), text in self._response_cache.items()
+        ]
+
+    def _snapshot(self, period: str) -> None:
+        """Start a new period by snapshotting the cumulative counters."""
+        self.usage_data[f"total_requests_{period}_snap"] = self.usage_data["total_requests"]
+        pairs = SNAPSHOT_KEYS[period]
+        for model in self.usage_data["models"].values():
+            for key, snap_key in pairs:
+                model[snap_key] = model[key]
+
     def _reset_if_needed(self):
         """Check if any of the periods need to be reset."""
+        now_ts = int(time.time())
+        mask = (
+            (now_ts >= self._next_daily)
+            | (now_ts >= self._next_weekly) << 1
+            | (now_ts >= self._next_monthly) << 2
+        )
+        # Nothing is due in the common case, so skip all datetime work
+        if not mask:
+            return
+
         now = dt_util.utcnow()
 
         # Check daily reset
-        if now >= self.usage_data["last_reset_daily"] + datetime.timedelta(days=1):
+        if mask & 1:
+            self._next_daily = int(get_next_period_start("daily", now).timestamp())
             self.usage_data["last_reset_daily"] = get_period_start("daily", now)
-            self.usage_data["daily_requests"] = 0
-            for model in self.usage_data["models"].values():
-                model["daily_input_tokens"] = 0
-                model["daily_output_tokens"] = 0
-                model["daily_total_tokens"] = 0
+            self._snapshot("daily")
 
         # Check weekly reset
-        if now >= self.usage_data["last_reset_weekly"] + datetime.timedelta(weeks=1):
+        if mask & 2:
+            self._next_weekly = int(get_next_period_start("weekly", now).timestamp())
             self.usage_data["last_reset_weekly"] = get_period_start("weekly", now)
-            self.usage_data["weekly_requests"] = 0
-            for model in self.usage_data["models"].values():
-                model["weekly_input_tokens"] = 0
-                model["weekly_output_tokens"] = 0
-                model["weekly_total_tokens"] = 0
+            self._snapshot("weekly")
 
         # Check monthly reset
-        if now.month != self.usage_data["last_reset_monthly"].month:
+        if mask & 4:
+            self._next_monthly = int(get_next_period_start("monthly", now).timestamp())
             self.usage_data["last_reset_monthly"] = get_period_start("monthly", now)
-            self.usage_data["monthly_requests"] = 0
-            for model in self.usage_data["models"].values():
-                model["monthly_input_tokens"] = 0
-                model["monthly_output_tokens"] = 0
-                model["monthly_total_tokens"] = 0
+            self._snapshot("monthly")
+
+        self._schedule_save()
 
+    def register_model(self, model_name: str) -> dict[str, int]:
+        """Start tracking a model and return its usage counters."""
+        models = self.usage_data["models"]
+        if model_name not in models:
+            models[model_name] = dict.fromkeys(MODEL_COUNTER_KEYS, 0)
+        return models[model_name]
 
     async def _async_update_data(self):
         """Fetch data and reset periodic counters if necessary."""
@@ -109,34 +359,73 @@ class GeminiUsageDataUpdateCoordinator(DataUpdateCoordinator):
         self._reset_if_needed()
 
         usage = result.usage_metadata
-        input_tokens = getattr(usage, 'prompt_token_count', 0)
-        output_tokens = getattr(usage, 'candidates_token_count', 0)
-        total_tokens = getattr(usage, 'total_token_count', 0)
+        try:
+            input_tokens, output_tokens, total_tokens = _USAGE_FIELDS(usage)
+        except AttributeError:
+            input_tokens = getattr(usage, 'prompt_token_count', 0)
+            output_tokens = getattr(usage, 'candidates_token_count', 0)
+            total_tokens = getattr(usage, 'total_token_count', 0)
 
-        # Update total requests
+        # Update total requests; periodic counts are derived from the snapshots
         self.usage_data["total_requests"] += 1
-        self.usage_data["daily_requests"] += 1
-        self.usage_data["weekly_requests"] += 1
-        self.usage_data["monthly_requests"] += 1
 
         # Update model stats
-        model_stats = self.usage_data["models"][model_name]
+        model_stats = self.register_model(model_name)
         model_stats["input_tokens"] += input_tokens
         model_stats["output_tokens"] += output_tokens
         model_stats["total_tokens"] += total_tokens
-        
-        # Update periodic model stats
-        model_stats["daily_input_tokens"] += input_tokens
-        model_stats["daily_output_tokens"] += output_tokens
-        model_stats["daily_total_tokens"] += total_tokens
-        
-        model_stats["weekly_input_tokens"] += input_tokens
-        model_stats["weekly_output_tokens"] += output_tokens
-        model_stats["weekly_total_tokens"] += total_tokens
-
-        model_stats["monthly_input_tokens"] += input_tokens
-        model_stats["monthly_output_tokens"] += output_tokens
-        model_stats["monthly_total_tokens"] += total_tokens
-
-        # Schedule an immediate refresh to update sensors
-        self.async_schedule_refresh()
+        self._schedule_save()
+
+        # Request a debounced refresh so a burst of calls updates sensors once
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _get_model(self, model_name: str) -> "genai.GenerativeModel":
+        """Get the cached model, configuring the SDK once on first use."""
+        if (model := self._models.get(model_name)) is not None:
+            return model
+
+        with _GENAI_LOCK:
+            if (model := self._models.get(model_name)) is None:
+                # Imported here so the SDK only loads, in the executor, on first use
+                import google.generativeai as genai
+
+                if not self._genai_configured:
+                    genai.configure(api_key=self.api_key)
+                    self._genai_configured = True
+                model = self._models[model_name] = genai.GenerativeModel(model_name)
+        return model
+
+    def _generate_content(self, model_name: str, prompt: str):
+        """Run a blocking generate_content call with a cached model."""
+        return self._get_model(model_name).generate_content(prompt)
+
+    async def async_generate(self, model_name: str, prompt: str) -> str:
+        """Generate a response, reusing the cached one for a repeated prompt."""
+        cache_key = (model_name, hashlib.blake2b(prompt.encode()).hexdigest())
+        if (text := self._response_cache.get(cache_key)) is not None:
+            self._response_cache.move_to_end(cache_key)
+            self.usage_data["cache_hits"] += 1
+            self._schedule_save()
+            self.hass.async_create_task(self.async_request_refresh())
+            return text
+
+        # Use run_in_executor to avoid blocking the event loop
+        result = await self.hass.async_add_executor_job(
+            self._generate_content, model_name, prompt
+        )
+        # The call was made and billed, so count it even if it yields no text
+        self.update_usage_stats(model_name, result)
+
+        try:
+            text = result.text
+        except ValueError as err:
+            # Blocked responses are not cached, so a retry reaches the API again
+            raise ResponseBlocked(
+                f"No response text from {model_name}: {getattr(result, 'prompt_feedback', err)}"
+            ) from err
+
+        self._response_cache[cache_key] = text
+        if len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+        self._response_store.async_delay_save(self._responses_to_save, SAVE_DELAY)
+        return text
@@ -1,29 +1,47 @@
 """Sensor platform for Google Gemini Usage."""
+from abc import abstractmethod
+
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, SENSOR_CALLS_NAME
+from .const import (
+    ATTR_MODEL,
+    DOMAIN,
+    SENSOR_CACHE_HITS_NAME,
+    SENSOR_CALLS_NAME,
+)
 from .coordinator import GeminiUsageDataUpdateCoordinator
 
-# Dictionary to map period names to data keys
-PERIODS = {
-    "Daily": "daily",
-    "Weekly": "weekly",
-    "Monthly": "monthly",
-}
+# Pairs mapping period names to data keys
+PERIODS = (
+    ("Daily", "daily"),
+    ("Weekly", "weekly"),
+    ("Monthly", "monthly"),
+)
+
+TOKEN_TYPES = (
+    ("Total", "total"),
+    ("Input", "input"),
+    ("Output", "output"),
+)
+
+# Every (period_name, period_key, token_type_name, token_type_key) combination
+_PERIOD_TOKEN_COMBOS = tuple(
+    (period_name, period_key, token_type_name, token_type_key)
+    for period_name, period_key in PERIODS
+    for token_type_name, token_type_key in TOKEN_TYPES
+)
 
-TOKEN_TYPES = {
-    "Total": "total",
-    "Input": "input",
-    "Output": "output",
-}
+# Device info shared by every sensor of a config entry, keyed by entry ID
+_DEVICE_INFO: dict[str, DeviceInfo] = {}
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -34,51 +52,94 @@ async def async_setup_entry(
     coordinator: GeminiUsageDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
     await coordinator.async_config_entry_first_refresh()
 
-    entities = []
+    @callback
+    def _async_drop_device_info() -> None:
+        """Forget the shared device info of the unloaded entry."""
+        _DEVICE_INFO.pop(entry.entry_id, None)
 
-    # --- Total Increasing Sensors (survive restarts) ---
-    entities.append(TotalCallsSensor(coordinator, entry))
+    entry.async_on_unload(_async_drop_device_info)
 
-    # --- Periodic Usage Sensors (reset on restart) ---
-    for period_name, period_key in PERIODS.items():
-        entities.append(PeriodicCallsSensor(coordinator, entry, period_name, period_key))
-    
-    # --- Model-Specific Sensors ---
-    if "models" in coordinator.data:
-        for model_name in coordinator.data["models"]:
-            # Total increasing token sensors
-            entities.append(ModelTokenSensor(coordinator, entry, model_name, "Total", "total"))
-            entities.append(ModelTokenSensor(coordinator, entry, model_name, "Input", "input"))
-            entities.append(ModelTokenSensor(coordinator, entry, model_name, "Output", "output"))
-
-            # Periodic token sensors
-            for period_name, period_key in PERIODS.items():
-                for token_type_name, token_type_key in TOKEN_TYPES.items():
-                    entities.append(
-                        PeriodicModelTokenSensor(
-                            coordinator, entry, model_name, 
-                            period_name, period_key, 
-                            token_type_name, token_type_key
-                        )
-                    )
-
-    async_add_entities(entities)
+    async_add_entities(
+        [
+            # --- Total Increasing Sensors ---
+            TotalCallsSensor(coordinator, entry),
+            CacheHitsSensor(coordinator, entry),
+            # --- Periodic Usage Sensors (reset at each period boundary) ---
+            *(
+                PeriodicCallsSensor(coordinator, entry, period_name, period_key)
+                for period_name, period_key in PERIODS
+            ),
+        ]
+    )
+
+    # --- Model-Specific Sensors, added as each model is first seen ---
+    known_models: set[str] = set()
+
+    @callback
+    def _async_add_model_sensors() -> None:
+        """Add sensors for models registered since the last update."""
+        if not (new_models := coordinator.data["models"].keys() - known_models):
+            return
+        known_models.update(new_models)
+        async_add_entities(
+            [
+                sensor
+                for model_name in new_models
+                for sensor in _model_sensors(coordinator, entry, model_name)
+            ]
+        )
+
+    _async_add_model_sensors()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_model_sensors))
+
+
+def _model_sensors(coordinator, entry, model_name):
+    """Yield the token sensors for a single model."""
+    # Total increasing token sensors
+    for token_type_name, token_type_key in TOKEN_TYPES:
+        yield ModelTokenSensor(coordinator, entry, model_name, token_type_name, token_type_key)
+
+    # Periodic token sensors
+    for combo in _PERIOD_TOKEN_COMBOS:
+        yield PeriodicModelTokenSensor(coordinator, entry, model_name, *combo)
 
 
 class BaseGeminiSensor(CoordinatorEntity[GeminiUsageDataUpdateCoordinator], SensorEntity):
     """Base class for Gemini sensors."""
+    __slots__ = ()
+
     def __init__(self, coordinator: GeminiUsageDataUpdateCoordinator, entry: ConfigEntry):
         super().__init__(coordinator)
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "Google Gemini API Usage",
-            "manufacturer": "Google",
-        }
+        device_info = _DEVICE_INFO.get(entry.entry_id)
+        if device_info is None:
+            device_info = _DEVICE_INFO[entry.entry_id] = DeviceInfo(
+                identifiers={(DOMAIN, entry.entry_id)},
+                name="Google Gemini API Usage",
+                manufacturer="Google",
+            )
+        self._attr_device_info = device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Populate the cached state before it is first written."""
+        await super().async_added_to_hass()
+        self._update_from_data()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Cache the new value from the coordinator and write the state."""
+        self._update_from_data()
+        super()._handle_coordinator_update()
+
+    @abstractmethod
+    def _update_from_data(self) -> None:
+        """Update the cached state attributes from the coordinator data."""
 
 # --- SENSORS FOR TOTAL INCREASING VALUES ---
 
 class TotalCallsSensor(BaseGeminiSensor):
     """Representation of a total API calls sensor."""
+    __slots__ = ()
+
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_icon = "mdi:server-network"
     _attr_native_unit_of_measurement = "calls"
@@ -88,13 +149,33 @@ class TotalCallsSensor(BaseGeminiSensor):
         self._attr_name = SENSOR_CALLS_NAME
         self._attr_unique_id = f"{entry.entry_id}_total_calls"
 
-    @property
-    def native_value(self) -> int | None:
-        return self.coordinator.data.get("total_requests") if self.coordinator.data else None
+    def _update_from_data(self) -> None:
+        data = self.coordinator.data
+        self._attr_native_value = data.get("total_requests") if data else None
+
+
+class CacheHitsSensor(BaseGeminiSensor):
+    """Representation of the number of prompts answered from the response cache."""
+    __slots__ = ()
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:cached"
+    _attr_native_unit_of_measurement = "hits"
+
+    def __init__(self, coordinator: GeminiUsageDataUpdateCoordinator, entry: ConfigEntry):
+        super().__init__(coordinator, entry)
+        self._attr_name = SENSOR_CACHE_HITS_NAME
+        self._attr_unique_id = f"{entry.entry_id}_cache_hits"
+
+    def _update_from_data(self) -> None:
+        data = self.coordinator.data
+        self._attr_native_value = data.get("cache_hits") if data else None
 
 
 class ModelTokenSensor(BaseGeminiSensor):
     """Sensor for a specific token type (total, input, output) for a model."""
+    __slots__ = ("_model_name", "_token_type_key", "_value_key", "_attrs")
+
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_icon = "mdi:chip"
     _attr_native_unit_of_measurement = "tokens"
@@ -103,23 +184,26 @@ class ModelTokenSensor(BaseGeminiSensor):
         super().__init__(coordinator, entry)
         self._model_name = model_name
         self._token_type_key = token_type_key
+        self._value_key = f"{token_type_key}_tokens"
+        self._attrs = {ATTR_MODEL: model_name}
         self._attr_name = f"{model_name.replace('-', ' ').title()} {token_type_name} Tokens"
         self._attr_unique_id = f"{entry.entry_id}_{model_name}_{token_type_key}_tokens"
     
-    @property
-    def native_value(self) -> int | None:
-        if self.coordinator.data:
-            return self.coordinator.data["models"][self._model_name].get(f"{self._token_type_key}_tokens")
-        return None
+    def _update_from_data(self) -> None:
+        data = self.coordinator.data
+        model_stats = data["models"].get(self._model_name) if data else None
+        self._attr_native_value = model_stats.get(self._value_key) if model_stats else None
 
     @property
     def extra_state_attributes(self):
-        return {"model": self._model_name}
+        return self._attrs
 
 # --- SENSORS FOR PERIODIC (RESETTING) VALUES ---
 
 class PeriodicCallsSensor(BaseGeminiSensor):
     """Representation of a periodic API calls sensor (daily, weekly, monthly)."""
+    __slots__ = ("_period_key", "_snap_key", "_reset_key")
+
     _attr_state_class = SensorStateClass.TOTAL
     _attr_icon = "mdi:server-network"
     _attr_native_unit_of_measurement = "calls"
@@ -127,20 +211,28 @@ class PeriodicCallsSensor(BaseGeminiSensor):
     def __init__(self, coordinator, entry, period_name, period_key):
         super().__init__(coordinator, entry)
         self._period_key = period_key
+        self._snap_key = f"total_requests_{period_key}_snap"
+        self._reset_key = f"last_reset_{period_key}"
         self._attr_name = f"{SENSOR_CALLS_NAME} {period_name}"
         self._attr_unique_id = f"{entry.entry_id}_{period_key}_calls"
 
-    @property
-    def native_value(self) -> int | None:
-        return self.coordinator.data.get(f"{self._period_key}_requests") if self.coordinator.data else None
-
-    @property
-    def last_reset(self):
-        return self.coordinator.data.get(f"last_reset_{self._period_key}") if self.coordinator.data else None
+    def _update_from_data(self) -> None:
+        data = self.coordinator.data
+        if data:
+            self._attr_native_value = data["total_requests"] - data[self._snap_key]
+            self._attr_last_reset = data.get(self._reset_key)
+        else:
+            self._attr_native_value = None
+            self._attr_last_reset = None
 
 
 class PeriodicModelTokenSensor(BaseGeminiSensor):
     """Sensor for periodic token usage for a model."""
+    __slots__ = (
+        "_model_name", "_period_key", "_token_type_key",
+        "_value_key", "_snap_key", "_reset_key", "_attrs",
+    )
+
     _attr_state_class = SensorStateClass.TOTAL
     _attr_icon = "mdi:chip"
     _attr_native_unit_of_measurement = "tokens"
@@ -150,20 +242,23 @@ class PeriodicModelTokenSensor(BaseGeminiSensor):
         self._model_name = model_name
         self._period_key = period_key
         self._token_type_key = token_type_key
+        self._value_key = f"{token_type_key}_tokens"
+        self._snap_key = f"{token_type_key}_tokens_{period_key}_snap"
+        self._reset_key = f"last_reset_{period_key}"
+        self._attrs = {ATTR_MODEL: model_name}
         self._attr_name = f"{model_name.replace('-', ' ').title()} {token_type_name} Tokens {period_name}"
         self._attr_unique_id = f"{entry.entry_id}_{model_name}_{period_key}_{token_type_key}_tokens"
 
-    @property
-    def native_value(self) -> int | None:
-        if self.coordinator.data:
-            key = f"{self._period_key}_{self._token_type_key}_tokens"
-            return self.coordinator.data["models"][self._model_name].get(key)
-        return None
-
-    @property
-    def last_reset(self):
-        return self.coordinator.data.get(f"last_reset_{self._period_key}") if self.coordinator.data else None
+    def _update_from_data(self) -> None:
+        data = self.coordinator.data
+        model_stats = data["models"].get(self._model_name) if data else None
+        if model_stats is not None:
+            self._attr_native_value = model_stats[self._value_key] - model_stats[self._snap_key]
+            self._attr_last_reset = data.get(self._reset_key)
+        else:
+            self._attr_native_value = None
+            self._attr_last_reset = None
     
     @property
     def extra_state_attributes(self):
-        return {"model": self._model_name}
+        return self._attrs